@@ -2,6 +2,8 @@
  * Sample utility functions for demonstrating AutoTypeScript type inference
  */
 
+const crypto = require("crypto");
+
 /**
  * Greets a user with optional formal style
  */
@@ -17,10 +19,10 @@ function greet(name, age, options) {
  * Calculates the total price with optional discount
  */
 function calculateTotal(items, discount) {
-  const subtotal = items.reduce(
-    (sum, item) => sum + item.price * item.quantity,
-    0
-  );
+  let subtotal = 0;
+  for (let i = 0; i < items.length; i++) {
+    subtotal += items[i].price * items[i].quantity;
+  }
   if (discount) {
     return subtotal * (1 - discount);
   }
@@ -39,22 +41,66 @@ function formatUser(user) {
   };
 }
 
+/**
+ * Reduction kernels shared by processNumbers and processNumbersBatch
+ */
+function sumNumbers(numbers) {
+  let sum = 0;
+  for (let i = 0; i < numbers.length; i++) {
+    sum += numbers[i];
+  }
+  return sum;
+}
+
+function averageNumbers(numbers) {
+  return sumNumbers(numbers) / numbers.length;
+}
+
+// Plain loops instead of spreading into Math.max/min, which is
+// limited by the engine's maximum argument count
+function maxNumber(numbers) {
+  let max = -Infinity;
+  for (let i = 0; i < numbers.length; i++) {
+    max = Math.max(max, numbers[i]);
+  }
+  return max;
+}
+
+function minNumber(numbers) {
+  let min = Infinity;
+  for (let i = 0; i < numbers.length; i++) {
+    min = Math.min(min, numbers[i]);
+  }
+  return min;
+}
+
+// Reductions by operation name; prototype-less so names like "constructor"
+// fall through to the default instead of resolving to Object.prototype
+const NUMBER_OPERATIONS = Object.assign(Object.create(null), {
+  sum: sumNumbers,
+  avg: averageNumbers,
+  max: maxNumber,
+  min: minNumber,
+});
+
 /**
  * Processes an array of numbers
  */
 function processNumbers(numbers, operation) {
-  switch (operation) {
-    case "sum":
-      return numbers.reduce((a, b) => a + b, 0);
-    case "avg":
-      return numbers.reduce((a, b) => a + b, 0) / numbers.length;
-    case "max":
-      return Math.max(...numbers);
-    case "min":
-      return Math.min(...numbers);
-    default:
-      return numbers;
+  const reduce = NUMBER_OPERATIONS[operation];
+  return reduce ? reduce(numbers) : numbers;
+}
+
+/**
+ * Processes several arrays of numbers with the same operation in one call
+ */
+function processNumbersBatch(arrays, operation) {
+  const reduce = NUMBER_OPERATIONS[operation];
+  const results = new Array(arrays.length);
+  for (let i = 0; i < arrays.length; i++) {
+    results[i] = reduce ? reduce(arrays[i]) : arrays[i];
   }
+  return results;
 }
 
 /**
@@ -62,7 +108,7 @@ function processNumbers(numbers, operation) {
  */
 function createTask(title, priority, assignee) {
   return {
-    id: Math.random().toString(36).substr(2, 9),
+    id: crypto.randomBytes(5).toString("hex").slice(0, 9),
     title,
     priority: priority || "medium",
     assignee: assignee || null,
@@ -92,6 +138,87 @@ function filterItems(items, criteria) {
   });
 }
 
+/**
+ * Converts items into columns (price, quantity, category, inStock) so that
+ * repeated totals and filters over the same items run as tight loops over
+ * typed arrays instead of walking an array of objects each time
+ */
+function itemsToColumns(items) {
+  const count = items.length;
+  const price = new Float64Array(count);
+  const quantity = new Float64Array(count);
+  const category = new Array(count);
+  const inStock = new Array(count);
+  for (let i = 0; i < count; i++) {
+    const item = items[i];
+    price[i] = item.price;
+    quantity[i] = item.quantity;
+    category[i] = item.category;
+    inStock[i] = item.inStock;
+  }
+  return { price, quantity, category, inStock };
+}
+
+/**
+ * Calculates the total price from item columns, with optional discount
+ */
+function calculateTotalColumns(columns, discount) {
+  const { price, quantity } = columns;
+  let subtotal = 0;
+  for (let i = 0; i < price.length; i++) {
+    subtotal += price[i] * quantity[i];
+  }
+  if (discount) {
+    return subtotal * (1 - discount);
+  }
+  return subtotal;
+}
+
+/**
+ * Filters item columns based on criteria, returning the matching indices
+ */
+function filterItemsColumns(columns, criteria) {
+  const { price, category, inStock } = columns;
+  const count = price.length;
+  // One pass per criterion over a single column, combined in a mask
+  const mask = new Uint8Array(count).fill(1);
+  if (criteria.minPrice !== undefined) {
+    for (let i = 0; i < count; i++) {
+      if (price[i] < criteria.minPrice) {
+        mask[i] = 0;
+      }
+    }
+  }
+  if (criteria.maxPrice !== undefined) {
+    for (let i = 0; i < count; i++) {
+      if (price[i] > criteria.maxPrice) {
+        mask[i] = 0;
+      }
+    }
+  }
+  if (criteria.category) {
+    for (let i = 0; i < count; i++) {
+      if (category[i] !== criteria.category) {
+        mask[i] = 0;
+      }
+    }
+  }
+  if (criteria.inStock !== undefined) {
+    for (let i = 0; i < count; i++) {
+      if (inStock[i] !== criteria.inStock) {
+        mask[i] = 0;
+      }
+    }
+  }
+  const matches = [];
+  for (let i = 0; i < count; i++) {
+    if (mask[i]) {
+      matches.push(i);
+    }
+  }
+  return matches;
+}
+
 /**
  * Merges configuration objects
  */
@@ -104,7 +231,11 @@ module.exports = {
   calculateTotal,
   formatUser,
   processNumbers,
+  processNumbersBatch,
   createTask,
   filterItems,
+  itemsToColumns,
+  calculateTotalColumns,
+  filterItemsColumns,
   mergeConfig,
 };
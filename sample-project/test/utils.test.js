@@ -8,8 +8,12 @@ const {
   calculateTotal,
   formatUser,
   processNumbers,
+  processNumbersBatch,
   createTask,
   filterItems,
+  itemsToColumns,
+  calculateTotalColumns,
+  filterItemsColumns,
   mergeConfig,
 } = require("../src/utils");
 
@@ -128,11 +132,48 @@ describe("Utils", function () {
       assert.strictEqual(result, 1);
     });
 
+    it("should handle arrays larger than the argument limit", function () {
+      const nums = Array.from({ length: 200000 }, (_, i) => i);
+      assert.strictEqual(processNumbers(nums, "max"), 199999);
+      assert.strictEqual(processNumbers(nums, "min"), 0);
+    });
+
     it("should return original for unknown operation", function () {
       const nums = [1, 2, 3];
       const result = processNumbers(nums, "unknown");
       assert.deepStrictEqual(result, nums);
     });
+
+    it("should not treat Object.prototype names as operations", function () {
+      const nums = [1, 2, 3];
+      assert.deepStrictEqual(processNumbers(nums, "constructor"), nums);
+      assert.deepStrictEqual(processNumbers(nums, "toString"), nums);
+    });
+  });
+
+  describe("processNumbersBatch", function () {
+    it("should apply the operation to every array", function () {
+      const result = processNumbersBatch([[1, 2, 3], [10, 20], []], "sum");
+      assert.deepStrictEqual(result, [6, 30, 0]);
+    });
+
+    it("should match processNumbers for each array", function () {
+      const arrays = [
+        [5, 2, 9],
+        [4, 8],
+      ];
+      const result = processNumbersBatch(arrays, "avg");
+      assert.deepStrictEqual(result, [
+        processNumbers(arrays[0], "avg"),
+        processNumbers(arrays[1], "avg"),
+      ]);
+    });
+
+    it("should return arrays unchanged for unknown operation", function () {
+      const arrays = [[1], [2, 3]];
+      const result = processNumbersBatch(arrays, "unknown");
+      assert.deepStrictEqual(result, arrays);
+    });
   });
 
   describe("createTask", function () {
@@ -144,6 +185,11 @@ describe("Utils", function () {
       assert.ok(task.id);
     });
 
+    it("should generate 9-character ids", function () {
+      const task = createTask("Write docs");
+      assert.match(task.id, /^[0-9a-f]{9}$/);
+    });
+
     it("should create high priority task", function () {
       const task = createTask("Deploy to prod", "high");
       assert.strictEqual(task.priority, "high");
@@ -189,6 +235,54 @@ describe("Utils", function () {
     });
   });
 
+  describe("item columns", function () {
+    const items = [
+      { price: 25, quantity: 2, category: "clothing", inStock: true },
+      { price: 50, quantity: 1, category: "clothing", inStock: false },
+      { price: 500, quantity: 1, category: "electronics", inStock: true },
+      { price: 300, quantity: 3, category: "electronics", inStock: true },
+    ];
+
+    it("should convert items to columns", function () {
+      const columns = itemsToColumns(items);
+      assert.deepStrictEqual(Array.from(columns.price), [25, 50, 500, 300]);
+      assert.deepStrictEqual(columns.category, [
+        "clothing",
+        "clothing",
+        "electronics",
+        "electronics",
+      ]);
+    });
+
+    it("should match calculateTotal", function () {
+      const columns = itemsToColumns(items);
+      assert.strictEqual(calculateTotalColumns(columns), calculateTotal(items));
+      assert.strictEqual(
+        calculateTotalColumns(columns, 0.1),
+        calculateTotal(items, 0.1)
+      );
+    });
+
+    it("should match filterItems", function () {
+      const columns = itemsToColumns(items);
+      const criteria = {
+        category: "electronics",
+        maxPrice: 400,
+        inStock: true,
+      };
+      const indices = filterItemsColumns(columns, criteria);
+      assert.deepStrictEqual(
+        indices.map((i) => items[i]),
+        filterItems(items, criteria)
+      );
+    });
+
+    it("should return all indices without criteria", function () {
+      const indices = filterItemsColumns(itemsToColumns(items), {});
+      assert.deepStrictEqual(indices, [0, 1, 2, 3]);
+    });
+  });
+
   describe("mergeConfig", function () {
     it("should merge configs", function () {
       const defaults = { debug: false, timeout: 5000, retries: 3 };
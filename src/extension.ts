@@ -1,7 +1,7 @@
 import * as vscode from 'vscode';
 import * as path from 'path';
 import * as fs from 'fs';
-import { TypeCacheManager, TypeCacheTreeProvider } from './typeCacheManager';
+import { CacheFormat, TypeCacheManager, TypeCacheTreeProvider } from './typeCacheManager';
 import { TestRunner } from './testRunner';
 import { TypeHoverProvider } from './hoverProvider';
 import { generateTypeDefinitions, extractInterfacesFromCache } from './typeInference';
@@ -25,8 +25,9 @@ export function activate(context: vscode.ExtensionContext) {
     // Initialize managers
     const config = vscode.workspace.getConfiguration('autotypescript');
     const maxSamples = config.get<number>('maxSamplesPerParam', 50);
+    const cacheFormat = config.get<CacheFormat>('cacheFormat', 'json');
 
-    typeCacheManager = new TypeCacheManager(workspaceRoot, maxSamples);
+    typeCacheManager = new TypeCacheManager(workspaceRoot, maxSamples, cacheFormat);
     typeCacheManager.load();
 
     testRunner = new TestRunner(outputChannel, typeCacheManager, workspaceRoot);
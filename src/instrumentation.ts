@@ -1,6 +1,8 @@
 import * as acorn from "acorn";
 import * as walk from "acorn-walk";
 import { generate } from "astring";
+import * as fs from "fs";
+import * as path from "path";
 
 const INSTRUMENTATION_NAMESPACE = "__AUTOTYPESCRIPT__";
 
@@ -11,6 +13,12 @@ type AnyNode = any;
  * Transform JavaScript code to add instrumentation for type capture
  */
 export function transformCodeForInstrumentation(code: string): string {
+  // Every function form except a bare "x => x" arrow has a parameter list, so code with
+  // neither "(" nor "=>" has nothing to instrument; skip the parse/generate round trip
+  if (!code.includes("(") && !code.includes("=>")) {
+    return code;
+  }
+
   try {
     const ast = acorn.parse(code, {
       ecmaVersion: "latest",
@@ -18,10 +26,13 @@ export function transformCodeForInstrumentation(code: string): string {
       allowReturnOutsideFunction: true,
     });
 
+    // Collect functions during the walk and rewrite them afterwards
+    const pending: Array<[AnyNode, string]> = [];
+
     walk.ancestor(ast, {
-      FunctionDeclaration(node: AnyNode, ancestors: AnyNode[]) {
+      FunctionDeclaration(node: AnyNode) {
         if (node.id && node.id.name) {
-          instrumentFunctionNode(node, node.id.name, ancestors);
+          pending.push([node, node.id.name]);
         }
       },
       FunctionExpression(node: AnyNode, ancestors: AnyNode[]) {
@@ -48,7 +59,7 @@ export function transformCodeForInstrumentation(code: string): string {
           }
         }
         if (name) {
-          instrumentFunctionNode(node, name, ancestors);
+          pending.push([node, name]);
         }
       },
       ArrowFunctionExpression(node: AnyNode, ancestors: AnyNode[]) {
@@ -74,11 +85,15 @@ export function transformCodeForInstrumentation(code: string): string {
           }
         }
         if (name) {
-          instrumentFunctionNode(node, name, ancestors);
+          pending.push([node, name]);
         }
       },
     });
 
+    for (const [node, name] of pending) {
+      instrumentFunctionNode(node, name);
+    }
+
     return generate(ast);
   } catch (e) {
     // If transformation fails, return original code
@@ -87,12 +102,7 @@ export function transformCodeForInstrumentation(code: string): string {
   }
 }
 
-function instrumentFunctionNode(
-  node: AnyNode,
-  funcName: string,
-  _ancestors: AnyNode[]
-): void {
-  // eslint-disable-line @typescript-eslint/no-unused-vars
+function instrumentFunctionNode(node: AnyNode, funcName: string): void {
   if (node._instrumentedDDT) {
     return;
   }
@@ -184,6 +194,38 @@ function instrumentFunctionNode(
   node._instrumentedDDT = true;
 }
 
+/**
+ * Directory where the runtime caches instrumented sources, next to the type cache
+ */
+export function getTransformCacheDir(cacheFilePath: string): string {
+  return path.join(path.dirname(cacheFilePath), "transform-cache");
+}
+
+/**
+ * Remove cached transforms that no test run has used for maxAgeMs. The runtime
+ * refreshes an entry's mtime on every hit, so only stale sources are dropped.
+ */
+export function pruneTransformCache(
+  cacheFilePath: string,
+  maxAgeMs = 7 * 24 * 60 * 60 * 1000
+): void {
+  const cacheDir = getTransformCacheDir(cacheFilePath);
+  if (!fs.existsSync(cacheDir)) {
+    return;
+  }
+  const cutoff = Date.now() - maxAgeMs;
+  for (const entry of fs.readdirSync(cacheDir)) {
+    const entryPath = path.join(cacheDir, entry);
+    try {
+      if (fs.statSync(entryPath).mtimeMs < cutoff) {
+        fs.rmSync(entryPath, { force: true });
+      }
+    } catch {
+      // Removed concurrently by another run
+    }
+  }
+}
+
 /**
  * Generate the runtime code that needs to be injected into the test environment
  */
@@ -199,6 +241,8 @@ export function generateRuntimeInstrumentationCode(
 (function() {
     const fs = require('fs');
     const path = require('path');
+    const crypto = require('crypto');
+    const v8 = require('v8');
     const Module = require('module');
     
     // Try to load from local .autotypescript/node_modules first, then fall back to project's node_modules
@@ -217,17 +261,31 @@ export function generateRuntimeInstrumentationCode(
     const astring = tryRequire('astring');
     
     const UNDEFINED_MARKER = '[[UNDEFINED_MARKER_VALUE]]';
+    const FUNCTION_MARKER = '[Function]';
+    const SYMBOL_MARKER = '[Symbol]';
     const MAX_SAMPLES_PER_PARAM = 50;
     const INSTRUMENTATION_NAMESPACE = '__AUTOTYPESCRIPT__';
+    const FLUSH_INTERVAL_MS = 5000;
+    // Cache files ending in .bin use V8's binary serializer instead of JSON
+    const BINARY_CACHE = ${JSON.stringify(outputFile.endsWith(".bin"))};
+    
+    // Set when calls are recorded since the last save
+    let cacheDirty = false;
+    // Set after a save fails, so the periodic flush stops retrying (and logging) every
+    // interval; the exit save still makes a final attempt
+    let saveFailed = false;
     
-    // Type cache stored in memory
-    const typeCache = {};
+    // Type cache stored in memory; prototype-less so function names such as
+    // "constructor" or "toString" are looked up as plain own keys
+    const typeCache = Object.create(null);
     
     // Load existing cache if available
     try {
         const cacheFile = ${JSON.stringify(outputFile)};
         if (fs.existsSync(cacheFile)) {
-            const existingCache = JSON.parse(fs.readFileSync(cacheFile, 'utf8'));
+            const existingCache = BINARY_CACHE
+                ? v8.deserialize(fs.readFileSync(cacheFile))
+                : JSON.parse(fs.readFileSync(cacheFile, 'utf8'));
             Object.assign(typeCache, existingCache);
         }
     } catch (e) {
@@ -235,16 +293,57 @@ export function generateRuntimeInstrumentationCode(
     }
     
     function deepCloneSafe(value, depth = 0, maxDepth = 10) {
+        const pending = [];
+        const result = cloneValue(value, depth, maxDepth, pending);
+        
+        // Values JSON could not handle are copied with an explicit work stack
+        // rather than by recursing once per nesting level
+        while (pending.length > 0) {
+            const { source, target, depth: level, parent, key: parentKey } = pending.pop();
+            try {
+                if (Array.isArray(source)) {
+                    for (let i = 0; i < source.length; i++) {
+                        target[i] = cloneValue(source[i], level + 1, maxDepth, pending, target, i);
+                    }
+                    continue;
+                }
+                for (const key in source) {
+                    if (Object.prototype.hasOwnProperty.call(source, key)) {
+                        try {
+                            target[key] = cloneValue(source[key], level + 1, maxDepth, pending, target, key);
+                        } catch (e) {
+                            target[key] = "[Error Cloning Property]";
+                        }
+                    }
+                }
+            } catch (e) {
+                // A value that can't be walked (e.g. a Proxy whose traps throw) is replaced
+                // in its parent, as a failed nested copy was before
+                if (!parent) throw e;
+                parent[parentKey] = "[Error Cloning Property]";
+            }
+        }
+        
+        return result;
+    }
+    
+    function cloneValue(value, depth, maxDepth, pending, parent, key) {
         if (depth > maxDepth) return "[Max Depth Exceeded]";
+        // Fast path for the common JSON-native scalars
+        const type = typeof value;
+        if (type === 'string' || type === 'number' || type === 'boolean') return value;
         if (value === undefined) return UNDEFINED_MARKER;
-        if (value === null || typeof value !== 'object') return value;
-        if (typeof value === 'function') return "[Function]";
+        if (type === 'function') return FUNCTION_MARKER;
+        // Symbols can't be stored by either cache format (v8.serialize throws on them)
+        if (type === 'symbol') return SYMBOL_MARKER;
+        if (value === null || type !== 'object') return value;
         
         try {
             const seen = new WeakSet();
             return JSON.parse(JSON.stringify(value, (key, val) => {
                 if (val === undefined) return UNDEFINED_MARKER;
-                if (typeof val === 'function') return "[Function]";
+                if (typeof val === 'function') return FUNCTION_MARKER;
+                if (typeof val === 'symbol') return SYMBOL_MARKER;
                 if (typeof val === 'object' && val !== null) {
                     if (seen.has(val)) return "[Circular]";
                     seen.add(val);
@@ -252,48 +351,164 @@ export function generateRuntimeInstrumentationCode(
                 return val;
             }));
         } catch (e) {
-            if (Array.isArray(value)) {
-                return value.map(item => deepCloneSafe(item, depth + 1, maxDepth));
+            const target = Array.isArray(value) ? [] : {};
+            pending.push({ source: value, target, depth, parent, key });
+            return target;
+        }
+    }
+    
+    // Compare param name lists element-wise; runs on every call, so avoid JSON.stringify
+    function sameParamNames(a, b) {
+        if (!a || a.length !== b.length) return false;
+        for (let i = 0; i < b.length; i++) {
+            if (a[i] !== b[i]) return false;
+        }
+        return true;
+    }
+    
+    // In-memory bookkeeping per function that is never written to the cache file
+    const functionStates = new Map();
+    
+    // Every state is created here with the same fields, so all of them share one shape:
+    // - cursors: ring-buffer write position per param index
+    // - typeCounts: Map of sample type key -> number of samples per param slot
+    function getFunctionState(functionName) {
+        let state = functionStates.get(functionName);
+        if (!state) {
+            state = { cursors: [], typeCounts: [] };
+            functionStates.set(functionName, state);
+        }
+        return state;
+    }
+    
+    // Type key for a raw argument or stored sample. Every key except 'object' fully
+    // determines the inferred type; objects and arrays still need their shapes sampled.
+    function sampleTypeKey(value) {
+        if (value === null) return 'null';
+        if (value === undefined || value === UNDEFINED_MARKER) return 'undefined';
+        const type = typeof value;
+        if (type === 'function' || value === FUNCTION_MARKER) return 'function';
+        if (value === SYMBOL_MARKER) return 'symbol';
+        return type;
+    }
+    
+    // Count the samples of each type already in a slot (e.g. loaded from disk)
+    function getTypeCounts(samples, state, index) {
+        let counts = state.typeCounts[index];
+        if (!counts) {
+            counts = state.typeCounts[index] = new Map();
+            for (const sample of samples) {
+                const key = sampleTypeKey(sample);
+                counts.set(key, (counts.get(key) || 0) + 1);
             }
-            const objRepresentation = {};
-            for (const key in value) {
-                if (Object.prototype.hasOwnProperty.call(value, key)) {
-                    try {
-                        objRepresentation[key] = deepCloneSafe(value[key], depth + 1, maxDepth);
-                    } catch (innerE) {
-                        objRepresentation[key] = "[Error Cloning Property]";
-                    }
+        }
+        return counts;
+    }
+    
+    // Once a param holds MAX_SAMPLES_PER_PARAM samples, overwrite the oldest one
+    // in place rather than shifting the whole array
+    function addSample(samples, counts, state, index, value, typeKey) {
+        counts.set(typeKey, (counts.get(typeKey) || 0) + 1);
+        if (samples.length < MAX_SAMPLES_PER_PARAM) {
+            samples.push(value);
+            return;
+        }
+        const cursor = state.cursors[index] || 0;
+        const evictedKey = sampleTypeKey(samples[cursor]);
+        counts.set(evictedKey, counts.get(evictedKey) - 1);
+        samples[cursor] = value;
+        state.cursors[index] = (cursor + 1) % MAX_SAMPLES_PER_PARAM;
+    }
+    
+    // Put every ring buffer back in chronological order (oldest first) before saving,
+    // so the next process, whose cursors start at 0, overwrites the oldest samples first
+    function restoreSampleOrder() {
+        for (const [functionName, state] of functionStates) {
+            const paramData = typeCache[functionName].paramData;
+            for (let index = 0; index < state.cursors.length; index++) {
+                const cursor = state.cursors[index];
+                if (cursor) {
+                    const samples = paramData[index];
+                    samples.push(...samples.splice(0, cursor));
+                    state.cursors[index] = 0;
                 }
             }
-            return objRepresentation;
         }
     }
     
+    // Stream the cache one function at a time in compact JSON, then move it into place
+    // so readers (and other test processes) never see a partially written file
+    function writeCacheFile(cacheFile) {
+        restoreSampleOrder();
+        const tmpFile = cacheFile + '.' + process.pid + '.tmp';
+        if (BINARY_CACHE) {
+            try {
+                fs.writeFileSync(tmpFile, v8.serialize(typeCache));
+            } catch (e) {
+                // Don't leave a partial temp file behind (e.g. the disk filled up mid-write)
+                fs.rmSync(tmpFile, { force: true });
+                throw e;
+            }
+            fs.renameSync(tmpFile, cacheFile);
+            return;
+        }
+        const fd = fs.openSync(tmpFile, 'w');
+        try {
+            let separator = '{';
+            for (const functionName in typeCache) {
+                fs.writeSync(fd, separator + JSON.stringify(functionName) + ':' + JSON.stringify(typeCache[functionName]));
+                separator = ',';
+            }
+            fs.writeSync(fd, separator === '{' ? '{}' : '}');
+        } catch (e) {
+            // Don't leave a partial temp file behind (e.g. a sample JSON can't encode)
+            fs.closeSync(fd);
+            fs.unlinkSync(tmpFile);
+            throw e;
+        }
+        fs.closeSync(fd);
+        fs.renameSync(tmpFile, cacheFile);
+    }
+    
     global.${INSTRUMENTATION_NAMESPACE} = {
         recordArguments: function(functionName, originalArgs, thisVal, paramNamesFromAST) {
-            const args = Array.from(originalArgs);
+            let entry = typeCache[functionName];
+            if (!entry) {
+                entry = typeCache[functionName] = { callCount: 0, paramData: {}, paramNames: paramNamesFromAST || [] };
+            } else if (paramNamesFromAST && paramNamesFromAST.length > 0 && 
+                       !sameParamNames(entry.paramNames, paramNamesFromAST)) {
+                entry.paramNames = paramNamesFromAST;
+            }
+            entry.callCount++;
+            cacheDirty = true;
             
-            if (!typeCache[functionName]) {
-                typeCache[functionName] = { callCount: 0, paramData: {}, paramNames: paramNamesFromAST || [] };
-            } else {
-                if (paramNamesFromAST && paramNamesFromAST.length > 0 && 
-                    JSON.stringify(typeCache[functionName].paramNames) !== JSON.stringify(paramNamesFromAST)) {
-                    typeCache[functionName].paramNames = paramNamesFromAST;
-                }
+            // Read the arguments object (or array for arrow functions) in place instead of copying it
+            const argCount = originalArgs.length;
+            if (argCount === 0) {
+                return;
             }
-            typeCache[functionName].callCount++;
             
-            args.forEach((arg, index) => {
-                if (!typeCache[functionName].paramData[index]) {
-                    typeCache[functionName].paramData[index] = [];
+            const paramData = entry.paramData;
+            const state = getFunctionState(functionName);
+            for (let index = 0; index < argCount; index++) {
+                let samples = paramData[index];
+                if (!samples) {
+                    samples = paramData[index] = [];
+                } else if (samples.length > MAX_SAMPLES_PER_PARAM) {
+                    // Loaded from a cache written with a larger limit; drop the oldest samples
+                    samples.splice(0, samples.length - MAX_SAMPLES_PER_PARAM);
                 }
-                const clonedArg = deepCloneSafe(arg);
-                
-                if (typeCache[functionName].paramData[index].length >= MAX_SAMPLES_PER_PARAM) {
-                    typeCache[functionName].paramData[index].shift();
+                const arg = originalArgs[index];
+                const typeKey = sampleTypeKey(arg);
+                const counts = getTypeCounts(samples, state, index);
+                // A full slot holding nothing but this scalar type gains nothing from another sample;
+                // any other slot keeps rotating so stale types are eventually evicted
+                if (typeKey !== 'object' && samples.length >= MAX_SAMPLES_PER_PARAM &&
+                        counts.get(typeKey) === samples.length) {
+                    continue;
                 }
-                typeCache[functionName].paramData[index].push(clonedArg);
-            });
+                addSample(samples, counts, state, index, deepCloneSafe(arg), typeKey);
+            }
         },
         
         getTypeCache: function() {
@@ -307,19 +522,25 @@ export function generateRuntimeInstrumentationCode(
                 if (!fs.existsSync(dir)) {
                     fs.mkdirSync(dir, { recursive: true });
                 }
-                // Only save if we have actual data to prevent empty overwrites from parent processes
-                if (Object.keys(typeCache).length > 0) {
-                    fs.writeFileSync(cacheFile, JSON.stringify(typeCache, null, 2));
+                // Only save when this process recorded something, so parent processes
+                // (e.g. npm or the test runner's launcher) don't overwrite newer data
+                if (cacheDirty && Object.keys(typeCache).length > 0) {
+                    writeCacheFile(cacheFile);
+                    cacheDirty = false;
                 }
+                saveFailed = false;
             } catch (e) {
-                console.error('[AutoTypeScript] Failed to save type cache:', e);
+                if (!saveFailed) {
+                    console.error('[AutoTypeScript] Failed to save type cache:', e);
+                }
+                saveFailed = true;
             }
         }
     };
     
     // ========== Code Transformation Functions ==========
     
-    function instrumentFunctionNode(node, funcName, ancestors) {
+    function instrumentFunctionNode(node, funcName) {
         if (node._instrumentedDDT) {
             return;
         }
@@ -393,6 +614,12 @@ export function generateRuntimeInstrumentationCode(
     }
     
     function transformCode(code) {
+        // Every function form except a bare "x => x" arrow has a parameter list, so code with
+        // neither "(" nor "=>" has nothing to instrument; skip the parse/generate round trip
+        if (!code.includes('(') && !code.includes('=>')) {
+            return code;
+        }
+        
         try {
             const ast = acorn.parse(code, {
                 ecmaVersion: 'latest',
@@ -400,10 +627,13 @@ export function generateRuntimeInstrumentationCode(
                 allowReturnOutsideFunction: true,
             });
 
+            // Collect functions during the walk and rewrite them afterwards
+            const pending = [];
+            
             walk.ancestor(ast, {
-                FunctionDeclaration(node, ancestors) {
+                FunctionDeclaration(node) {
                     if (node.id && node.id.name) {
-                        instrumentFunctionNode(node, node.id.name, ancestors);
+                        pending.push([node, node.id.name]);
                     }
                 },
                 FunctionExpression(node, ancestors) {
@@ -421,7 +651,7 @@ export function generateRuntimeInstrumentationCode(
                         }
                     }
                     if (name) {
-                        instrumentFunctionNode(node, name, ancestors);
+                        pending.push([node, name]);
                     }
                 },
                 ArrowFunctionExpression(node, ancestors) {
@@ -437,11 +667,15 @@ export function generateRuntimeInstrumentationCode(
                         }
                     }
                     if (name) {
-                        instrumentFunctionNode(node, name, ancestors);
+                        pending.push([node, name]);
                     }
                 },
             });
 
+            for (const [node, name] of pending) {
+                instrumentFunctionNode(node, name);
+            }
+            
             return astring.generate(ast);
         } catch (e) {
             // If transformation fails, return original code
@@ -454,27 +688,124 @@ export function generateRuntimeInstrumentationCode(
     // Get the workspace root from environment or derive from cache path
     const cacheFile = ${JSON.stringify(outputFile)};
     const workspaceRoot = path.dirname(path.dirname(cacheFile));
+    const workspacePrefix = workspaceRoot + path.sep;
+    const excludedDirectories = new Set(['node_modules', '.autotypescript']);
+    
+    // Version of an installed parser/generator package, resolved the same way as tryRequire
+    function packageVersion(moduleName) {
+        try {
+            let resolved;
+            try {
+                resolved = require.resolve(path.join(${localModulesPath}, moduleName));
+            } catch (e) {
+                resolved = require.resolve(moduleName);
+            }
+            // Walk up from the entry point to the package's own package.json
+            let dir = path.dirname(resolved);
+            while (path.dirname(dir) !== dir) {
+                const packageFile = path.join(dir, 'package.json');
+                if (fs.existsSync(packageFile)) {
+                    const pkg = JSON.parse(fs.readFileSync(packageFile, 'utf8'));
+                    if (pkg.name === moduleName) {
+                        return pkg.version;
+                    }
+                }
+                dir = path.dirname(dir);
+            }
+        } catch (e) {
+            // Fall through
+        }
+        return 'unknown';
+    }
+    
+    // Transformed sources are cached on disk, keyed by the source, the transformer's own
+    // code and the acorn/astring versions, so unchanged files skip parse/instrument/generate
+    // on later test runs. The extension prunes entries unused for a week.
+    const transformCacheDir = ${JSON.stringify(getTransformCacheDir(outputFile))};
+    const transformerVersion = crypto.createHash('sha1')
+        .update(instrumentFunctionNode.toString())
+        .update(transformCode.toString())
+        .update(['acorn', 'acorn-walk', 'astring'].map(packageVersion).join(','))
+        .digest('hex');
+    
+    function transformCodeCached(code) {
+        const key = crypto.createHash('sha1').update(transformerVersion).update(code).digest('hex');
+        const cachedFile = path.join(transformCacheDir, key + '.js');
+        try {
+            const cached = fs.readFileSync(cachedFile, 'utf8');
+            try {
+                // Mark the entry as used so pruning keeps it
+                const now = new Date();
+                fs.utimesSync(cachedFile, now, now);
+            } catch (e) {
+                // Best-effort
+            }
+            return cached;
+        } catch (e) {
+            // Not cached yet
+        }
+        const transformed = transformCode(code);
+        if (transformed === code) {
+            // Nothing instrumented (pre-filtered or failed to parse); re-checking is cheaper
+            // than a cache file, and a parse failure shouldn't be persisted
+            return code;
+        }
+        try {
+            fs.mkdirSync(transformCacheDir, { recursive: true });
+            const tmpFile = cachedFile + '.' + process.pid + '.tmp';
+            fs.writeFileSync(tmpFile, transformed);
+            fs.renameSync(tmpFile, cachedFile);
+        } catch (e) {
+            // Caching is best-effort
+        }
+        return transformed;
+    }
+    
+    // Per-file instrumentation decisions, so path checks run once per file
+    const instrumentDecisions = new Map();
+    
+    // Only transform .js files in the workspace (not node_modules)
+    function shouldInstrument(filename) {
+        let decision = instrumentDecisions.get(filename);
+        if (decision === undefined) {
+            // Match excluded names against directory segments below the workspace root only,
+            // so a workspace that itself lives under e.g. node_modules is still instrumented
+            decision = filename.endsWith('.js') &&
+                filename.startsWith(workspacePrefix) &&
+                !filename.slice(workspacePrefix.length).split(path.sep)
+                    .some((segment) => excludedDirectories.has(segment));
+            instrumentDecisions.set(filename, decision);
+        }
+        return decision;
+    }
     
     // Store the original compile function
     const originalCompile = Module.prototype._compile;
     
-    // Override the compile function to transform code
-    Module.prototype._compile = function(content, filename) {
-        // Only transform .js files in the workspace (not node_modules)
-        if (filename.endsWith('.js') && 
-            filename.startsWith(workspaceRoot) && 
-            !filename.includes('node_modules') &&
-            !filename.includes('.autotypescript')) {
+    // Override the compile function to transform code. This is the last step before
+    // evaluation, so loaders registered later (e.g. @babel/register) have already
+    // transpiled the source; shouldInstrument keeps the per-call cost to one Map lookup.
+    Module.prototype._compile = function(content, filename, ...rest) {
+        if (shouldInstrument(filename)) {
             try {
-                content = transformCode(content);
+                content = transformCodeCached(content);
             } catch (e) {
                 // If transformation fails, use original content
                 console.error('[AutoTypeScript] Failed to transform:', filename, e.message);
             }
         }
-        return originalCompile.call(this, content, filename);
+        return originalCompile.call(this, content, filename, ...rest);
     };
     
+    // Flush periodically during long test runs so the exit save has less to do and
+    // a crashed run still leaves recent data behind; unref so it never keeps the process alive
+    const flushTimer = setInterval(() => {
+        if (!saveFailed) {
+            global.${INSTRUMENTATION_NAMESPACE}.saveTypeCache();
+        }
+    }, FLUSH_INTERVAL_MS);
+    flushTimer.unref();
+    
     // Save cache on process exit
     process.on('exit', () => {
         global.${INSTRUMENTATION_NAMESPACE}.saveTypeCache();
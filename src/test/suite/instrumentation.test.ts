@@ -28,6 +28,18 @@ suite('Code Instrumentation Test Suite', () => {
             assert.strictEqual(result, invalidCode);
         });
 
+        test('should return code without functions unchanged', () => {
+            const code = `const config = { retries: 3 };\nmodule.exports = config;`;
+            const result = transformCodeForInstrumentation(code);
+            assert.strictEqual(result, code);
+        });
+
+        test('should instrument modules that only define shorthand methods', () => {
+            const code = `module.exports = { add(a, b) { return a + b; }, get size() { return 1; } };`;
+            const result = transformCodeForInstrumentation(code);
+            assert.ok(result.includes('__AUTOTYPESCRIPT__'));
+        });
+
         test('should handle multiple functions', () => {
             const code = `
                 function first(a) { return a; }
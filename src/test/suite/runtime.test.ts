@@ -0,0 +1,135 @@
+import * as assert from 'assert';
+import * as childProcess from 'child_process';
+import * as fs from 'fs';
+import * as os from 'os';
+import * as path from 'path';
+import * as v8 from 'v8';
+import {
+    generateRuntimeInstrumentationCode,
+    getTransformCacheDir,
+    pruneTransformCache,
+} from '../../instrumentation';
+
+// The extension's own node_modules provide acorn, acorn-walk and astring to the runtime
+const extensionRoot = path.resolve(__dirname, '../../..');
+
+/**
+ * Run a script in a fresh Node process with the runtime instrumentation preloaded,
+ * the same way test processes get it through NODE_OPTIONS
+ */
+function runWithRuntime(
+    workspace: string,
+    script: string,
+    cacheFileName = 'type-cache.json'
+): string {
+    const setupDir = path.join(workspace, '.autotypescript');
+    const setupFile = path.join(setupDir, 'setup.js');
+    if (!fs.existsSync(setupFile)) {
+        fs.mkdirSync(setupDir, { recursive: true });
+        const cacheFile = path.join(setupDir, cacheFileName);
+        fs.writeFileSync(setupFile, generateRuntimeInstrumentationCode(cacheFile, extensionRoot));
+    }
+    return childProcess.execFileSync(process.execPath, ['--require', setupFile, '-e', script], {
+        cwd: workspace,
+        env: { ...process.env, ELECTRON_RUN_AS_NODE: '1' },
+        encoding: 'utf-8',
+    });
+}
+
+function getCacheFile(workspace: string): string {
+    return path.join(workspace, '.autotypescript', 'type-cache.json');
+}
+
+function readSamples(workspace: string, functionName: string): unknown[] {
+    const cache = JSON.parse(fs.readFileSync(getCacheFile(workspace), 'utf-8'));
+    return cache[functionName].paramData[0];
+}
+
+suite('Runtime Instrumentation Test Suite', () => {
+    let workspace: string;
+
+    setup(() => {
+        workspace = fs.mkdtempSync(path.join(os.tmpdir(), 'autotypescript-runtime-'));
+    });
+
+    teardown(() => {
+        fs.rmSync(workspace, { recursive: true, force: true });
+    });
+
+    test('should replace samples of a stale type once a param changes type', () => {
+        const record = (value: string) =>
+            `for (let i = 0; i < 60; i++) __AUTOTYPESCRIPT__.recordArguments('f', [${value}], null, ['x']);`;
+
+        runWithRuntime(workspace, record('"s" + i'));
+        assert.ok(readSamples(workspace, 'f').every((sample) => typeof sample === 'string'));
+
+        runWithRuntime(workspace, record('i'));
+        const samples = readSamples(workspace, 'f');
+        assert.strictEqual(samples.length, 50);
+        assert.ok(samples.every((sample) => typeof sample === 'number'));
+    });
+
+    test('should load unchanged workspace files from the transform cache', () => {
+        fs.writeFileSync(path.join(workspace, 'answer.js'), 'module.exports = (() => 42)();');
+        const script = `process.stdout.write(String(require('./answer.js')));`;
+        assert.strictEqual(runWithRuntime(workspace, script), '42');
+
+        // Replace the cached transform; a cache hit must serve it instead of re-instrumenting
+        const transformCacheDir = getTransformCacheDir(getCacheFile(workspace));
+        const entries = fs.readdirSync(transformCacheDir);
+        assert.strictEqual(entries.length, 1);
+        fs.writeFileSync(path.join(transformCacheDir, entries[0]), 'module.exports = "cached";');
+        assert.strictEqual(runWithRuntime(workspace, script), 'cached');
+    });
+
+    test('should not cache workspace files the transform leaves unchanged', () => {
+        fs.writeFileSync(path.join(workspace, 'config.js'), 'module.exports = { retries: 3 };');
+        runWithRuntime(workspace, `require('./config.js');`);
+        assert.ok(!fs.existsSync(getTransformCacheDir(getCacheFile(workspace))));
+    });
+
+    test('should instrument sources after loaders registered later have transpiled them', () => {
+        fs.writeFileSync(
+            path.join(workspace, 'greet.js'),
+            'module.exports = function greet(name: string) { return name; };'
+        );
+        // A pirates-style hook (as used by @babel/register) that strips the type annotation
+        const script = `
+            const Module = require('module');
+            const load = Module._extensions['.js'];
+            Module._extensions['.js'] = function(module, filename) {
+                const compile = module._compile;
+                module._compile = function(content, name) {
+                    return compile.call(this, content.replace(': string', ''), name);
+                };
+                return load.call(this, module, filename);
+            };
+            require('./greet.js')('world');
+        `;
+        runWithRuntime(workspace, script);
+        assert.deepStrictEqual(readSamples(workspace, 'greet'), ['world']);
+    });
+
+    test('should save symbol arguments in the binary cache format', () => {
+        const script = `__AUTOTYPESCRIPT__.recordArguments('f', [Symbol('k')], null, ['x']);`;
+        runWithRuntime(workspace, script, 'type-cache.bin');
+        const cacheFile = path.join(workspace, '.autotypescript', 'type-cache.bin');
+        const cache = v8.deserialize(fs.readFileSync(cacheFile));
+        assert.deepStrictEqual(cache.f.paramData[0], ['[Symbol]']);
+    });
+
+    test('should prune transform cache entries that have not been used recently', () => {
+        const transformCacheDir = getTransformCacheDir(getCacheFile(workspace));
+        fs.mkdirSync(transformCacheDir, { recursive: true });
+        const staleFile = path.join(transformCacheDir, 'stale.js');
+        const freshFile = path.join(transformCacheDir, 'fresh.js');
+        fs.writeFileSync(staleFile, '');
+        fs.writeFileSync(freshFile, '');
+        const lastWeek = new Date(Date.now() - 8 * 24 * 60 * 60 * 1000);
+        fs.utimesSync(staleFile, lastWeek, lastWeek);
+
+        pruneTransformCache(getCacheFile(workspace));
+        assert.ok(!fs.existsSync(staleFile));
+        assert.ok(fs.existsSync(freshFile));
+    });
+});
@@ -5,6 +5,7 @@ import {
     generateTypeDefinitions,
     UNDEFINED_MARKER,
     FUNCTION_MARKER,
+    SYMBOL_MARKER,
     CIRCULAR_MARKER,
     MAX_DEPTH_MARKER,
     deepCloneSafe,
@@ -23,6 +24,7 @@ suite('Type Inference Test Suite', () => {
         test('should handle special markers', () => {
             assert.strictEqual(inferSingleValueType(UNDEFINED_MARKER), 'undefined');
             assert.strictEqual(inferSingleValueType(FUNCTION_MARKER), 'Function');
+            assert.strictEqual(inferSingleValueType(SYMBOL_MARKER), 'symbol');
             assert.strictEqual(inferSingleValueType(CIRCULAR_MARKER), 'object /* circular */');
             assert.strictEqual(inferSingleValueType(MAX_DEPTH_MARKER), 'object /* max depth */');
         });
@@ -75,6 +77,15 @@ suite('Type Inference Test Suite', () => {
             assert.strictEqual(deepCloneSafe(() => {}), FUNCTION_MARKER);
         });
 
+        test('should replace symbols with a marker', () => {
+            assert.strictEqual(deepCloneSafe(Symbol('k')), SYMBOL_MARKER);
+            assert.deepStrictEqual(deepCloneSafe({ key: Symbol('k') }), { key: SYMBOL_MARKER });
+            assert.deepStrictEqual(
+                deepCloneSafe({ key: Symbol('k'), id: BigInt(1) }),
+                { key: SYMBOL_MARKER, id: BigInt(1) }
+            );
+        });
+
         test('should clone objects', () => {
             const obj = { name: 'test', value: 42 };
             const cloned = deepCloneSafe(obj);
@@ -86,6 +97,51 @@ suite('Type Inference Test Suite', () => {
             const cloned = deepCloneSafe(arr);
             assert.deepStrictEqual(cloned, arr);
         });
+
+        test('should clone values JSON cannot serialize', () => {
+            const obj = { id: BigInt(1), nested: { name: 'test' }, list: [BigInt(2), { ok: true }] };
+            const cloned = deepCloneSafe(obj);
+            assert.deepStrictEqual(cloned, obj);
+        });
+
+        test('should stop at max depth when JSON cannot serialize', () => {
+            let nested: Record<string, unknown> = { leaf: BigInt(1) };
+            for (let i = 0; i < 15; i++) {
+                nested = { child: nested };
+            }
+            let cloned = deepCloneSafe(nested, 0, 3) as Record<string, unknown>;
+            for (let i = 0; i < 3; i++) {
+                cloned = cloned.child as Record<string, unknown>;
+            }
+            assert.strictEqual(cloned.child, MAX_DEPTH_MARKER);
+        });
+
+        test('should mark nested values that cannot be walked', () => {
+            const throwingKeys = new Proxy({}, {
+                ownKeys() {
+                    throw new Error('no keys');
+                },
+            });
+            const throwingIndex = new Proxy([1], {
+                get(target, prop) {
+                    if (prop === '0') {
+                        throw new Error('no index');
+                    }
+                    return Reflect.get(target, prop);
+                },
+            });
+            const cloned = deepCloneSafe({ ok: 1, keys: throwingKeys, list: [throwingIndex] });
+            assert.deepStrictEqual(cloned, {
+                ok: 1,
+                keys: '[Error Cloning Property]',
+                list: ['[Error Cloning Property]'],
+            });
+        });
+
+        test('should replace scalars beyond max depth with the marker', () => {
+            const cloned = deepCloneSafe({ name: 'test', id: BigInt(1) }, 0, 0);
+            assert.deepStrictEqual(cloned, { name: MAX_DEPTH_MARKER, id: MAX_DEPTH_MARKER });
+        });
     });
 
     suite('generateTypeDefinitions', () => {
@@ -4,8 +4,9 @@ import * as fs from "fs";
 import {
   transformCodeForInstrumentation,
   generateRuntimeInstrumentationCode,
+  pruneTransformCache,
 } from "./instrumentation";
-import { TypeCacheManager } from "./typeCacheManager";
+import { TypeCacheManager, readTypeCacheFile } from "./typeCacheManager";
 import { TypeCache } from "./typeInference";
 import { ChildProcess, spawn } from "child_process";
 
@@ -107,6 +108,7 @@ export class TestRunner {
     await this.copyDependencies(setupDir);
 
     const cacheFilePath = this.cacheManager.getCacheFilePath();
+    pruneTransformCache(cacheFilePath);
     const setupCode = generateRuntimeInstrumentationCode(
       cacheFilePath,
       setupDir
@@ -312,8 +314,7 @@ export class TestRunner {
 
     if (fs.existsSync(cacheFilePath)) {
       try {
-        const data = fs.readFileSync(cacheFilePath, "utf8");
-        const capturedCache: TypeCache = JSON.parse(data);
+        const capturedCache: TypeCache = readTypeCacheFile(cacheFilePath);
         this.cacheManager.merge(capturedCache);
         this.cacheManager.save();
         this.outputChannel.appendLine(
@@ -1,18 +1,82 @@
 import * as vscode from 'vscode';
 import * as fs from 'fs';
 import * as path from 'path';
-import { TypeCache, FunctionTypeData, deepCloneSafe } from './typeInference';
+import * as v8 from 'v8';
+import { TypeCache, FunctionTypeData, ParamData, deepCloneSafe } from './typeInference';
+import { getTransformCacheDir } from './instrumentation';
+
+/**
+ * Compare two param name lists element-wise
+ */
+function sameParamNames(a: string[] | undefined, b: string[]): boolean {
+    if (!a || a.length !== b.length) {
+        return false;
+    }
+    for (let i = 0; i < b.length; i++) {
+        if (a[i] !== b[i]) {
+            return false;
+        }
+    }
+    return true;
+}
+
+/**
+ * On-disk format of the type cache: readable JSON, or V8's binary serializer
+ */
+export type CacheFormat = 'json' | 'binary';
+
+/**
+ * Cache files ending in .bin use V8's binary serializer; anything else is JSON
+ */
+function isBinaryCacheFile(filePath: string): boolean {
+    return filePath.endsWith('.bin');
+}
+
+/**
+ * Read a type cache file in the format implied by its extension
+ */
+export function readTypeCacheFile(filePath: string): TypeCache {
+    const data = fs.readFileSync(filePath);
+    return isBinaryCacheFile(filePath) ? v8.deserialize(data) : JSON.parse(data.toString('utf8'));
+}
+
+/**
+ * Write a type cache file in the format implied by its extension. Writes go to a temp
+ * file that is moved into place, so a concurrent test run never reads a partial cache.
+ */
+export function writeTypeCacheFile(filePath: string, cache: TypeCache): void {
+    const tmpPath = `${filePath}.${process.pid}.tmp`;
+    try {
+        fs.writeFileSync(tmpPath, isBinaryCacheFile(filePath) ? v8.serialize(cache) : JSON.stringify(cache));
+    } catch (error) {
+        // Don't leave a partial temp file behind (e.g. the disk filled up mid-write)
+        fs.rmSync(tmpPath, { force: true });
+        throw error;
+    }
+    fs.renameSync(tmpPath, filePath);
+}
+
+/**
+ * Create a cache object without a prototype, so function-name lookups only hit
+ * own properties (a function named "toString" must not resolve to Object.prototype)
+ */
+function createEmptyCache(): TypeCache {
+    return Object.create(null);
+}
 
 /**
  * Manages the type cache for the extension
  */
 export class TypeCacheManager {
-    private cache: TypeCache = {};
+    private cache: TypeCache = createEmptyCache();
     private cacheFilePath: string;
     private maxSamplesPerParam: number;
+    // Ring-buffer write positions per function, one slot per param index
+    private sampleCursors = new Map<string, number[]>();
 
-    constructor(workspaceRoot: string, maxSamples: number = 50) {
-        this.cacheFilePath = path.join(workspaceRoot, '.autotypescript', 'type-cache.json');
+    constructor(workspaceRoot: string, maxSamples: number = 50, cacheFormat: CacheFormat = 'json') {
+        const cacheFileName = cacheFormat === 'binary' ? 'type-cache.bin' : 'type-cache.json';
+        this.cacheFilePath = path.join(workspaceRoot, '.autotypescript', cacheFileName);
         this.maxSamplesPerParam = maxSamples;
     }
 
@@ -22,12 +86,12 @@ export class TypeCacheManager {
     load(): void {
         try {
             if (fs.existsSync(this.cacheFilePath)) {
-                const data = fs.readFileSync(this.cacheFilePath, 'utf8');
-                this.cache = JSON.parse(data);
+                this.cache = Object.assign(createEmptyCache(), readTypeCacheFile(this.cacheFilePath));
+                this.sampleCursors.clear();
             }
         } catch (error) {
             console.error('[AutoTypeScript] Failed to load type cache:', error);
-            this.cache = {};
+            this.cache = createEmptyCache();
         }
     }
 
@@ -40,7 +104,8 @@ export class TypeCacheManager {
             if (!fs.existsSync(dir)) {
                 fs.mkdirSync(dir, { recursive: true });
             }
-            fs.writeFileSync(this.cacheFilePath, JSON.stringify(this.cache, null, 2));
+            this.restoreSampleOrder();
+            writeTypeCacheFile(this.cacheFilePath, this.cache);
         } catch (error) {
             console.error('[AutoTypeScript] Failed to save type cache:', error);
         }
@@ -50,7 +115,13 @@ export class TypeCacheManager {
      * Clear the type cache
      */
     clear(): void {
-        this.cache = {};
+        this.cache = createEmptyCache();
+        this.sampleCursors.clear();
+        try {
+            fs.rmSync(getTransformCacheDir(this.cacheFilePath), { recursive: true, force: true });
+        } catch (error) {
+            console.error('[AutoTypeScript] Failed to clear transform cache:', error);
+        }
         this.save();
     }
 
@@ -72,36 +143,26 @@ export class TypeCacheManager {
      * Record arguments for a function call
      */
     recordArguments(functionName: string, args: unknown[], paramNames: string[]): void {
-        if (!this.cache[functionName]) {
-            this.cache[functionName] = {
+        let entry = this.cache[functionName];
+        if (!entry) {
+            entry = this.cache[functionName] = {
                 callCount: 0,
                 paramData: {},
                 paramNames: paramNames || [],
             };
         } else if (paramNames && paramNames.length > 0) {
             // Update param names if they changed
-            const existingNames = JSON.stringify(this.cache[functionName].paramNames);
-            const newNames = JSON.stringify(paramNames);
-            if (existingNames !== newNames) {
-                this.cache[functionName].paramNames = paramNames;
+            if (!sameParamNames(entry.paramNames, paramNames)) {
+                entry.paramNames = paramNames;
             }
         }
 
-        this.cache[functionName].callCount++;
-
-        args.forEach((arg, index) => {
-            if (!this.cache[functionName].paramData[index]) {
-                this.cache[functionName].paramData[index] = [];
-            }
-
-            const clonedArg = deepCloneSafe(arg);
+        entry.callCount++;
 
-            // Keep only the most recent samples
-            if (this.cache[functionName].paramData[index].length >= this.maxSamplesPerParam) {
-                this.cache[functionName].paramData[index].shift();
-            }
-            this.cache[functionName].paramData[index].push(clonedArg);
-        });
+        const cursors = this.getSampleCursors(functionName);
+        for (let index = 0; index < args.length; index++) {
+            this.addSample(entry.paramData, cursors, index, deepCloneSafe(args[index]));
+        }
     }
 
     /**
@@ -115,42 +176,84 @@ export class TypeCacheManager {
 
             const otherData = otherCache[funcName];
 
-            if (!this.cache[funcName]) {
-                this.cache[funcName] = {
+            let entry = this.cache[funcName];
+            if (!entry) {
+                entry = this.cache[funcName] = {
                     callCount: otherData.callCount,
                     paramData: {},
                     paramNames: otherData.paramNames || [],
                 };
             } else {
-                this.cache[funcName].callCount += otherData.callCount;
+                entry.callCount += otherData.callCount;
                 // Update param names if new ones are available
                 if (otherData.paramNames && otherData.paramNames.length > 0) {
-                    this.cache[funcName].paramNames = otherData.paramNames;
+                    entry.paramNames = otherData.paramNames;
                 }
             }
 
             // Merge param data
+            const cursors = this.getSampleCursors(funcName);
             for (const paramIndex in otherData.paramData) {
                 if (!Object.prototype.hasOwnProperty.call(otherData.paramData, paramIndex)) {
                     continue;
                 }
 
                 const idx = Number(paramIndex);
-                if (!this.cache[funcName].paramData[idx]) {
-                    this.cache[funcName].paramData[idx] = [];
+                for (const value of otherData.paramData[idx]) {
+                    this.addSample(entry.paramData, cursors, idx, value);
                 }
+            }
+        }
+    }
 
-                // Add new samples, respecting the max limit
-                for (const value of otherData.paramData[idx]) {
-                    if (this.cache[funcName].paramData[idx].length >= this.maxSamplesPerParam) {
-                        this.cache[funcName].paramData[idx].shift();
-                    }
-                    this.cache[funcName].paramData[idx].push(value);
+    /**
+     * Put every ring buffer back in chronological order (oldest first), so the cache on
+     * disk can be appended to by a process whose cursors start at 0
+     */
+    private restoreSampleOrder(): void {
+        for (const [functionName, cursors] of this.sampleCursors) {
+            const paramData = this.cache[functionName]?.paramData;
+            for (let index = 0; index < cursors.length; index++) {
+                const cursor = cursors[index];
+                if (cursor && paramData?.[index]) {
+                    const samples = paramData[index];
+                    samples.push(...samples.splice(0, cursor));
+                    cursors[index] = 0;
                 }
             }
         }
     }
 
+    private getSampleCursors(functionName: string): number[] {
+        let cursors = this.sampleCursors.get(functionName);
+        if (!cursors) {
+            cursors = [];
+            this.sampleCursors.set(functionName, cursors);
+        }
+        return cursors;
+    }
+
+    /**
+     * Add a sample for a parameter, keeping only the most recent samples.
+     * Once full, the oldest sample is overwritten in place instead of shifting the array.
+     */
+    private addSample(paramData: ParamData, cursors: number[], index: number, value: unknown): void {
+        let samples = paramData[index];
+        if (!samples) {
+            samples = paramData[index] = [];
+        } else if (samples.length > this.maxSamplesPerParam) {
+            // Loaded from a cache written with a larger limit; drop the oldest samples
+            samples.splice(0, samples.length - this.maxSamplesPerParam);
+        }
+        if (samples.length < this.maxSamplesPerParam) {
+            samples.push(value);
+            return;
+        }
+        const cursor = cursors[index] || 0;
+        samples[cursor] = value;
+        cursors[index] = (cursor + 1) % this.maxSamplesPerParam;
+    }
+
     /**
      * Get the cache file path
      */
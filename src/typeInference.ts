@@ -18,9 +18,22 @@ export interface TypeCache {
 // Special markers for serialization
 export const UNDEFINED_MARKER = "[[UNDEFINED_MARKER_VALUE]]";
 export const FUNCTION_MARKER = "[Function]";
+export const SYMBOL_MARKER = "[Symbol]";
 export const CIRCULAR_MARKER = "[Circular]";
 export const MAX_DEPTH_MARKER = "[Max Depth Exceeded]";
 
+/**
+ * A value that JSON could not clone, queued to be copied key by key into `target`
+ */
+interface PendingClone {
+  source: object;
+  target: unknown[] | Record<string, unknown>;
+  depth: number;
+  // Slot holding `target`, overwritten with an error marker if copying fails
+  parent?: unknown[] | Record<string, unknown>;
+  key?: string | number;
+}
+
 /**
  * Deep clone a value safely, handling circular references and special types
  */
@@ -28,19 +41,93 @@ export function deepCloneSafe(
   value: unknown,
   depth = 0,
   maxDepth = 10
+): unknown {
+  const pending: PendingClone[] = [];
+  const result = cloneValue(value, depth, maxDepth, pending);
+
+  // Values JSON could not handle are copied with an explicit work stack
+  // rather than by recursing once per nesting level
+  while (pending.length > 0) {
+    const { source, target, depth: level, parent, key: parentKey } =
+      pending.pop()!;
+    try {
+      if (Array.isArray(source)) {
+        const targetArray = target as unknown[];
+        for (let i = 0; i < source.length; i++) {
+          targetArray[i] = cloneValue(
+            source[i],
+            level + 1,
+            maxDepth,
+            pending,
+            targetArray,
+            i
+          );
+        }
+        continue;
+      }
+      const targetObject = target as Record<string, unknown>;
+      for (const key in source) {
+        if (Object.prototype.hasOwnProperty.call(source, key)) {
+          try {
+            targetObject[key] = cloneValue(
+              (source as Record<string, unknown>)[key],
+              level + 1,
+              maxDepth,
+              pending,
+              targetObject,
+              key
+            );
+          } catch {
+            targetObject[key] = "[Error Cloning Property]";
+          }
+        }
+      }
+    } catch (error) {
+      // A value that can't be walked (e.g. a Proxy whose traps throw) is replaced
+      // in its parent, as a failed nested copy was before
+      if (!parent) {
+        throw error;
+      }
+      (parent as Record<string | number, unknown>)[parentKey!] =
+        "[Error Cloning Property]";
+    }
+  }
+
+  return result;
+}
+
+/**
+ * Clone a single value, queueing objects that JSON cannot serialize onto `pending`
+ */
+function cloneValue(
+  value: unknown,
+  depth: number,
+  maxDepth: number,
+  pending: PendingClone[],
+  parent?: PendingClone["parent"],
+  key?: string | number
 ): unknown {
   if (depth > maxDepth) {
     return MAX_DEPTH_MARKER;
   }
+  // Fast path for the common JSON-native scalars
+  const type = typeof value;
+  if (type === "string" || type === "number" || type === "boolean") {
+    return value;
+  }
   if (value === undefined) {
     return UNDEFINED_MARKER;
   }
-  if (value === null || typeof value !== "object") {
-    return value;
-  }
-  if (typeof value === "function") {
+  if (type === "function") {
     return FUNCTION_MARKER;
   }
+  // Symbols can't be stored by either cache format (v8.serialize throws on them)
+  if (type === "symbol") {
+    return SYMBOL_MARKER;
+  }
+  if (value === null || type !== "object") {
+    return value;
+  }
 
   try {
     const seen = new WeakSet();
@@ -52,6 +139,9 @@ export function deepCloneSafe(
         if (typeof val === "function") {
           return FUNCTION_MARKER;
         }
+        if (typeof val === "symbol") {
+          return SYMBOL_MARKER;
+        }
         if (typeof val === "object" && val !== null) {
           if (seen.has(val)) {
             return CIRCULAR_MARKER;
@@ -62,24 +152,9 @@ export function deepCloneSafe(
       })
     );
   } catch {
-    if (Array.isArray(value)) {
-      return value.map((item) => deepCloneSafe(item, depth + 1, maxDepth));
-    }
-    const objRepresentation: Record<string, unknown> = {};
-    for (const key in value as object) {
-      if (Object.prototype.hasOwnProperty.call(value, key)) {
-        try {
-          objRepresentation[key] = deepCloneSafe(
-            (value as Record<string, unknown>)[key],
-            depth + 1,
-            maxDepth
-          );
-        } catch {
-          objRepresentation[key] = "[Error Cloning Property]";
-        }
-      }
-    }
-    return objRepresentation;
+    const target = Array.isArray(value) ? [] : {};
+    pending.push({ source: value as object, target, depth, parent, key });
+    return target;
   }
 }
 
@@ -96,6 +171,9 @@ export function inferSingleValueType(value: unknown): string {
   if (value === FUNCTION_MARKER) {
     return "Function";
   }
+  if (value === SYMBOL_MARKER) {
+    return "symbol";
+  }
   if (value === CIRCULAR_MARKER) {
     return "object /* circular */";
   }
@@ -173,6 +251,8 @@ export function inferTypeForParam(
       primitiveTypes.add("undefined");
     } else if (value === FUNCTION_MARKER) {
       primitiveTypes.add("Function");
+    } else if (value === SYMBOL_MARKER) {
+      primitiveTypes.add("symbol");
     } else if (value === CIRCULAR_MARKER || value === MAX_DEPTH_MARKER) {
       primitiveTypes.add("object");
     } else if (Array.isArray(value)) {